@@ -433,6 +433,7 @@ class HaxallClient(HaystackClient):
                 data,
                 method=http_method,
                 context=self._context,
+                pool=self._pool,
             ).body
         )
 
@@ -6,7 +6,7 @@ from datetime import date
 from typing import TYPE_CHECKING, Any, Generator, Mapping, Self, Sequence
 
 from phable.auth.scram import ScramScheme
-from phable.http import ph_request
+from phable.http import PhConnectionPool, ph_request
 from phable.io.ph_decoder import PhDecoder
 from phable.io.ph_encoder import PhEncoder
 from phable.io.ph_io_factory import PH_IO_FACTORY
@@ -121,6 +121,10 @@ class HaystackClient:
     ```python
     from phable import HaystackClient
     ```
+
+    HTTP connections to the server are kept alive and reused between operations until
+    `close()` is called. A client may be shared between threads, in which case
+    concurrent operations use separate connections.
     """
 
     def __init__(
@@ -134,6 +138,7 @@ class HaystackClient:
         self.uri: str = uri[0:-1] if uri[-1] == "/" else uri
         self._auth_token: str = auth_token
         self._context: SSLContext | None = ssl_context
+        self._pool: PhConnectionPool = PhConnectionPool()
 
         io_factory = PH_IO_FACTORY[content_type]
         self._ph_encoder: PhEncoder = io_factory["encoder"]
@@ -195,7 +200,10 @@ class HaystackClient:
             An empty `Grid`.
         """
 
-        return self.call("close")
+        try:
+            return self.call("close")
+        finally:
+            self._pool.close()
 
     def read(self, filter: str, checked: bool = True) -> Mapping[str, Any]:
         """Read from the database the first record which matches the
@@ -662,6 +670,7 @@ class HaystackClient:
                 data=encoded_data,
                 method=method,
                 context=self._context,
+                pool=self._pool,
             ).body
         )
 
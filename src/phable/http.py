@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+import gzip
 import importlib.metadata
+import io
+import select
 import ssl
+import threading
 import urllib.request
 from dataclasses import dataclass
 from email.message import Message
-from http.client import HTTPResponse
+from http.client import (
+    HTTPConnection,
+    HTTPResponse,
+    HTTPSConnection,
+    RemoteDisconnected,
+)
 from typing import TYPE_CHECKING, Any
-from urllib.error import URLError
+from urllib.error import HTTPError, URLError
+from urllib.parse import SplitResult, urlsplit
 
 from phable.kinds import Grid
 from phable.logger import log_http_req, log_http_res
@@ -15,6 +25,9 @@ from phable.logger import log_http_req, log_http_res
 if TYPE_CHECKING:
     from ssl import SSLContext
 
+# methods that are safe to send again when a reused connection fails mid-request
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
 
 @dataclass
 class PhHttpResponse:
@@ -28,6 +41,149 @@ class PhHttpResponse:
     status: int
 
 
+class PhConnectionPool:
+    """Thread-safe pool of persistent HTTP connections.
+
+    Connections are kept alive after a response is fully read and reused for later
+    requests to the same host, so the TCP and TLS handshakes are only paid when a new
+    connection must be opened.
+
+    Idle connections already closed by the server are discarded before reuse. If a
+    reused connection fails after the request was sent, only idempotent requests are
+    retried, once, since the server may have already applied the request.
+
+    Parameters:
+        maxsize: Maximum number of idle connections kept open for reuse.
+    """
+
+    def __init__(self, maxsize: int = 8):
+        self._maxsize: int = maxsize
+        self._idle: list[tuple[tuple[str, str], HTTPConnection]] = []
+        self._lock: threading.Lock = threading.Lock()
+
+    def request(
+        self,
+        url: str,
+        headers: dict[str, Any],
+        data: bytes | None = None,
+        method: str = "GET",
+        context: SSLContext | None = None,
+    ) -> PhHttpResponse:
+        if not url.startswith("http"):
+            raise URLError('URL must begin with the prefix "http"')
+
+        split_url = urlsplit(url)
+        path = split_url.path or "/"
+        if split_url.query:
+            path += "?" + split_url.query
+
+        headers = headers.copy()
+        headers["User-Agent"] = f"phable/{importlib.metadata.version('phable')}"
+        headers["Connection"] = "keep-alive"
+
+        retried = False
+        while True:
+            conn, reused = self._get_conn(split_url, context)
+            try:
+                conn.request(method, path, body=data, headers=headers)
+                http_res = conn.getresponse()
+                body = http_res.read()
+            except (RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                conn.close()
+                # the server can drop a keep-alive connection after it has already
+                # processed the request, so POSTs are never sent a second time
+                if reused and not retried and method in _IDEMPOTENT_METHODS:
+                    retried = True
+                    continue
+                raise URLError(e) from e
+            except OSError as e:
+                conn.close()
+                raise URLError(e) from e
+            break
+
+        log_http_req(method, url, headers, data)
+
+        if http_res.will_close:
+            conn.close()
+        else:
+            self._put_conn(split_url, conn)
+
+        # redirects are not followed, so they surface as errors like any other
+        if http_res.status >= 300:
+            raise HTTPError(
+                url,
+                http_res.status,
+                http_res.reason,
+                http_res.headers,
+                io.BytesIO(_decode_body(body, http_res.headers)),
+            )
+
+        return PhHttpResponse(
+            body=body, headers=http_res.headers, status=http_res.status
+        )
+
+    def close(self) -> None:
+        """Closes all idle connections held by the pool."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+
+        for _, conn in idle:
+            conn.close()
+
+    def _get_conn(
+        self, split_url: SplitResult, context: SSLContext | None
+    ) -> tuple[HTTPConnection, bool]:
+        key = (split_url.scheme, split_url.netloc)
+
+        with self._lock:
+            while (i := _find_idle(self._idle, key)) is not None:
+                _, conn = self._idle.pop(i)
+                if not _is_dropped(conn):
+                    return conn, True
+                conn.close()
+
+        # an explicit port stops http.client from splitting a bare IPv6 host on ":"
+        host = split_url.hostname or ""
+        if split_url.scheme == "https":
+            if context is None:
+                context = ssl.create_default_context()
+            port = split_url.port or 443
+            return HTTPSConnection(host, port, context=context), False
+
+        return HTTPConnection(host, split_url.port or 80), False
+
+    def _put_conn(self, split_url: SplitResult, conn: HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self._maxsize:
+                self._idle.append(((split_url.scheme, split_url.netloc), conn))
+                return
+
+        conn.close()
+
+
+def _find_idle(
+    idle: list[tuple[tuple[str, str], HTTPConnection]], key: tuple[str, str]
+) -> int | None:
+    for i, (idle_key, _) in enumerate(idle):
+        if idle_key == key:
+            return i
+
+    return None
+
+
+def _is_dropped(conn: HTTPConnection) -> bool:
+    # an idle keep-alive socket has nothing to read unless the server closed it
+    if conn.sock is None:
+        return True
+
+    try:
+        readable, _, _ = select.select([conn.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+
+    return bool(readable)
+
+
 def ph_request(
     url: str,
     headers: dict[str, Any],
@@ -35,30 +191,53 @@ def ph_request(
     data: bytes | None = None,
     method: str = "GET",
     context: SSLContext | None = None,
+    pool: PhConnectionPool | None = None,
 ) -> PhHttpResponse:
     headers = headers.copy()
     headers["Content-Type"] = content_type
+    headers["Accept-Encoding"] = "gzip"
 
-    http_response = request(
-        url,
-        headers,
-        data,
-        method,
-        context,
-    )
-    ph_res = PhHttpResponse(
-        headers=http_response.headers,
-        status=http_response.status,
-        body=http_response.read(),
-    )
+    # requests routed through a proxy are left to urllib's proxy handling
+    if pool is not None and not _uses_proxy(url):
+        ph_res = pool.request(url, headers, data, method, context)
+    else:
+        try:
+            http_response = request(
+                url,
+                headers,
+                data,
+                method,
+                context,
+            )
+        except HTTPError as e:
+            body = _decode_body(e.read(), e.headers)
+            e.close()
+            raise HTTPError(
+                e.url, e.code, e.reason, e.headers, io.BytesIO(body)
+            ) from None
+
+        ph_res = PhHttpResponse(
+            headers=http_response.headers,
+            status=http_response.status,
+            body=http_response.read(),
+        )
+
+        http_response.close()
 
-    http_response.close()
+    ph_res.body = _decode_body(ph_res.body, ph_res.headers)
 
     log_http_res(ph_res.status, dict(ph_res.headers), ph_res.body)
 
     return ph_res
 
 
+def _decode_body(body: bytes, headers: Message) -> bytes:
+    if headers.get("Content-Encoding") == "gzip":
+        return gzip.decompress(body)
+
+    return body
+
+
 # only use request if a BufferedReader is required, otherwise use ph_request()
 def request(
     url: str,
@@ -91,3 +270,13 @@ def request(
     # http res data is logged in ph_request()
 
     return http_res
+
+
+def _uses_proxy(url: str) -> bool:
+    split_url = urlsplit(url)
+    proxies = urllib.request.getproxies()
+
+    if split_url.scheme not in proxies:
+        return False
+
+    return not urllib.request.proxy_bypass(split_url.hostname or "")
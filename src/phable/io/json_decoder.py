@@ -54,15 +54,15 @@ def _parse_val(value: Any) -> PhKind:
 
 
 def _parse_grid(json_data: dict[str, Any]) -> Grid:
-    dict_data = _parse_dict(json_data)
+    meta = _parse_dict(json_data["meta"])
 
-    cols = [_parse_grid_col(col) for col in dict_data["cols"]]
+    # write ops reply with an empty grid that has nothing to decode besides its meta
+    if not json_data["rows"] and json_data["cols"] == [{"name": "empty"}]:
+        return Grid(meta=meta, cols=[GridCol("empty")], rows=[])
 
-    return Grid(
-        meta=dict_data["meta"],
-        cols=cols,
-        rows=dict_data["rows"],
-    )
+    cols = [_parse_grid_col(_parse_dict(col)) for col in json_data["cols"]]
+
+    return Grid(meta=meta, cols=cols, rows=_parse_list(json_data["rows"]))
 
 
 def _parse_dict(value_dict: dict[str, Any]) -> dict[str, Any]:
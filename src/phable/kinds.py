@@ -276,6 +276,21 @@ class Grid:
 
         return Grid(meta=grid_meta, cols=cols, rows=normalized_rows)
 
+    @property
+    def is_empty(self) -> bool:
+        """`True` when the `Grid` has no rows."""
+        return not self.rows
+
+    def column(self, name: str) -> list[Any]:
+        """Returns the values for column `name` in row order.
+
+        Rows without a value for the column contribute `None`.
+
+        Parameters:
+            name: Name of the column to collect values from.
+        """
+        return [row.get(name) for row in self.rows]
+
     def to_pandas(self):
         """Converts time-series `Grid` to a long-format Pandas DataFrame.
 
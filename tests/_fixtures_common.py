@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from functools import cache
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+NY_TZ = ZoneInfo("America/New_York")
+
+AXON_CREATE_PT = (
+    """diff(null, {pytest, point, his, tz: "New_York", writable, """
+    """kind: "Number"}, {add}).commit"""
+)
+
+
+@cache
+def expected_schema() -> pa.Schema:
+    # pyarrow is imported lazily since most tests never build an Arrow table
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("id", pa.dictionary(pa.int32(), pa.string())),
+            ("ts", pa.timestamp("us", tz="America/New_York")),
+            ("val_bool", pa.bool_()),
+            ("val_str", pa.string()),
+            ("val_num", pa.float64()),
+            ("na", pa.bool_()),
+        ]
+    )
+
+
+@cache
+def ts_now() -> datetime:
+    return datetime.now(NY_TZ)
+
+
+def midnight_ny(
+    day_offset: int = 0, *, hour: int = 0, minute: int = 0, second: int = 0
+) -> datetime:
+    # offsets are relative to the session's ts_now() so every test agrees on today
+    day = ts_now().date() + timedelta(days=day_offset)
+    return datetime.combine(day, time(hour, minute, second), tzinfo=NY_TZ)
@@ -1,56 +1,271 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Generator, Mapping
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Generator, Mapping
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from urllib.error import HTTPError
 
-import random
-import pyarrow as pa
 import pytest
 
-from phable.kinds import NA, Grid, GridCol, Number, Ref, Marker
+from phable.kinds import (
+    NA,
+    DateRange,
+    DateTimeRange,
+    Grid,
+    GridCol,
+    Number,
+    Ref,
+    Marker,
+)
 from phable import (
+    CallError,
     HaystackClient,
     HaxallClient,
 )
+from tests._fixtures_common import AXON_CREATE_PT, expected_schema, midnight_ny
+from tests._fixtures_common import ts_now as _ts_now
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pyarrow as pa
 
 _URI = "http://localhost:8080/api/sys"
 _USERNAME = "su"
 _PASSWORD = "su"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def URI() -> str:
     return _URI
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def USERNAME() -> str:
     return _USERNAME
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def PASSWORD() -> str:
     return _PASSWORD
 
 
-TS_NOW = datetime.now(ZoneInfo("America/New_York"))
+# computed once so a run crossing midnight doesn't see a different day between
+# setup and the assertions
+@pytest.fixture(scope="session")
+def today() -> date:
+    # the New York date, matching the test points and midnight_ny()
+    return _ts_now().date()
 
-EXPECTED_SCHEMA = pa.schema(
-    [
-        ("id", pa.dictionary(pa.int32(), pa.string())),
-        ("ts", pa.timestamp("us", tz="America/New_York")),
-        ("val_bool", pa.bool_()),
-        ("val_str", pa.string()),
-        ("val_num", pa.float64()),
-        ("na", pa.bool_()),
-    ]
+
+@pytest.fixture(scope="session")
+def ts_now() -> datetime:
+    return _ts_now()
+
+
+# pytest tears down a parametrized session fixture whenever the active param changes,
+# so clients are cached explicitly to open exactly one per content type per run
+_CLIENT_CACHE: dict[str, HaystackClient] = {}
+
+
+def _open_client(config: pytest.Config, content_type: str) -> tuple[HaxallClient, bool]:
+    # the auth token is kept in the pytest cache so repeated local runs can skip
+    # the SCRAM handshake until the server stops accepting it, the returned flag
+    # tells whether the token was cached
+    cache = getattr(config, "cache", None)
+    cache_key = f"phable/auth_token/{content_type}"
+
+    auth_token = cache.get(cache_key, None) if cache is not None else None
+    if auth_token is not None:
+        hc = HaxallClient(_URI, auth_token, content_type=content_type)
+        try:
+            hc.about()
+            return hc, True
+        except HTTPError as e:
+            if e.status != 403:
+                raise
+
+    hc = HaxallClient.open(_URI, _USERNAME, _PASSWORD, content_type=content_type)
+    if cache is None:
+        return hc, False
+
+    cache.set(cache_key, hc._auth_token)
+    return hc, True
+
+
+def _get_client(config: pytest.Config, content_type: str) -> HaxallClient:
+    hc = _CLIENT_CACHE.get(content_type)
+
+    if hc is None:
+        hc, cached = _open_client(config, content_type)
+        _CLIENT_CACHE[content_type] = hc
+        # a cached session is left open on the server so the next run can reuse
+        # its token, any other session is closed once the run ends
+        config.add_cleanup(lambda: _release_client(content_type, cached))
+
+    return hc
+
+
+def _release_client(content_type: str, cached: bool) -> None:
+    hc = _CLIENT_CACHE.pop(content_type)
+    if not cached:
+        hc.close()
+
+
+_AXON_CLEAR_TEST_DATA = (
+    "readAll((site or point or equip) and pytest).toRecList"
+    ".map(r=> diff(r, null, {remove})).commit()"
 )
+_AXON_COUNT_TEST_DATA = "readCount((site or point or equip) and pytest)"
+
+
+def _check_test_data_counts(hc: HaxallClient, points: int, equips: int, sites: int):
+    for tag, expected in (("point", points), ("equip", equips), ("site", sites)):
+        count = hc.eval(f"readCount({tag} and pytest)").rows[0]["val"].val
+        if count != expected:
+            raise ValueError(
+                f"Unexpected number of pytest {tag}s in database. {count} != {expected}"
+            )
+
+
+def _configure_proj(hc: HaxallClient) -> None:
+    ph001, ph002, ph003, ph004 = map(Ref, ("ph-001", "ph-002", "ph-003", "ph-004"))
+    marker = Marker()
+    point = {
+        "siteRef": ph001,
+        "equipRef": ph002,
+        "point": marker,
+        "pytest": marker,
+        "his": marker,
+        "demand": marker,
+        "navName": "kW",
+        "kind": "Number",
+        "unit": "kW",
+        "tz": "New_York",
+    }
+
+    data = [
+        {
+            "id": ph001,
+            "site": marker,
+            "pytest": marker,
+            "dis": "Carytown",
+            "geoState": "VA",
+        },
+        {
+            "id": ph002,
+            "siteRef": ph001,
+            "equip": marker,
+            "pytest": marker,
+            "siteMeter": marker,
+            "dis": "Elec-Meter-01",
+            "elec": marker,
+            "meter": marker,
+        },
+        {"id": ph003} | point,
+        {"id": ph004} | point,
+    ]
+
+    stale_count = hc.eval(_AXON_COUNT_TEST_DATA).rows[0]["val"].val
+    if stale_count > 0:
+        print("Previous test records still in database, clearing then adding")
+        hc.eval(_AXON_CLEAR_TEST_DATA)
+
+    hc.commit_add(data)
+
+    try:
+        hc.eval('libAdd("hx.point")')
+    except CallError as e:
+        if "Lib already enabled: hx.point" not in e.help_msg.meta["errTrace"]:
+            raise e
 
+    _check_test_data_counts(hc, points=2, equips=1, sites=1)
 
-@pytest.fixture(params=["json", "zinc"], scope="module")
-def client(request) -> Generator[HaystackClient, None, None]:
-    hc = HaxallClient.open(_URI, _USERNAME, _PASSWORD, content_type=request.param)
+
+def _teardown_proj(hc: HaxallClient) -> None:
+    hc.eval(_AXON_CLEAR_TEST_DATA)
+    _check_test_data_counts(hc, points=0, equips=0, sites=0)
+
+
+@pytest.fixture(scope="session")
+def haxall_test_proj(
+    request: pytest.FixtureRequest, tmp_path_factory: pytest.TempPathFactory
+) -> Generator[None, None, None]:
+    hc = _get_client(request.config, "json")
+
+    if not hasattr(request.config, "workerinput"):
+        _configure_proj(hc)
+        yield
+        _teardown_proj(hc)
+        return
+
+    # pytest-xdist workers share the project, so the first worker to need it sets it
+    # up and the last one still using it tears it down
+    from filelock import FileLock
+
+    shared_dir = tmp_path_factory.getbasetemp().parent
+    lock = FileLock(shared_dir / "phable_test_proj.lock")
+    users_file = shared_dir / "phable_test_proj.users"
+
+    with lock:
+        users = _read_users(users_file)
+        if users == 0:
+            _configure_proj(hc)
+        users_file.write_text(str(users + 1))
+
+    yield
+
+    with lock:
+        users = _read_users(users_file) - 1
+        users_file.write_text(str(users))
+        if users == 0:
+            _teardown_proj(hc)
+
+
+def _read_users(users_file: Path) -> int:
+    return int(users_file.read_text()) if users_file.exists() else 0
+
+
+@pytest.fixture(params=["json", "zinc"], scope="session")
+def client(request, haxall_test_proj: None) -> HaystackClient:
+    return _get_client(request.config, request.param)
+
+
+# his grid fixture data is stored column-wise; _MISSING marks a cell absent from a row
+_MISSING = object()
+
+_NA = NA()
+_MARKER = Marker()
+_TS_COL = GridCol("ts")
+_HIS_GRID_ID = Ref("1234", "foo kW")
+
+_TS_OFFSETS = (timedelta(seconds=60), timedelta(seconds=30), timedelta(0))
+_SINGLE_PT_VAL = (_NA, Number(72.2, "kW"), Number(76.3, "kW"))
+_MULTI_PT_V0 = (_MISSING, _NA, Number(76.3, "kW"))
+_MULTI_PT_V1 = ("available", _MISSING, _NA)
+_MULTI_PT_V2 = (True, False, _MISSING)
+
+
+def _his_rows(
+    now: datetime, keys: tuple[str, ...], *val_cols: tuple[Any, ...]
+) -> list[dict[str, Any]]:
+    ts_col = (now - offset for offset in _TS_OFFSETS)
+    return [
+        {key: val for key, val in zip(keys, vals) if val is not _MISSING}
+        for vals in zip(ts_col, *val_cols)
+    ]
+
+
+@pytest.fixture(scope="session")
+def demand_points_grid(client: HaystackClient) -> Grid:
+    return client.read_all("point and demand and equipRef->siteMeter")
+
+
+@pytest.fixture(scope="session")
+def trailing_slash_client(
+    URI: str, USERNAME: str, PASSWORD: str
+) -> Generator[HaxallClient, None, None]:
+    hc = HaxallClient.open(URI + "/", USERNAME, PASSWORD)
 
     yield hc
 
@@ -71,15 +286,17 @@ def non_his_grid() -> Grid:
 
 @pytest.fixture(scope="module")
 def single_pt_his_grid() -> Grid:
+    now = _ts_now()
+
     meta = {
         "ver": "3.0",
-        "id": Ref("1234", "foo kW"),
-        "hisStart": TS_NOW - timedelta(hours=1),
-        "hisEnd": TS_NOW,
+        "id": _HIS_GRID_ID,
+        "hisStart": now - timedelta(hours=1),
+        "hisEnd": now,
     }
 
     cols = [
-        GridCol("ts"),
+        _TS_COL,
         GridCol(
             "val",
             {
@@ -89,203 +306,237 @@ def single_pt_his_grid() -> Grid:
             },
         ),
     ]
-    rows = [
-        {
-            "ts": TS_NOW - timedelta(seconds=60),
-            "val": NA(),
-        },
-        {
-            "ts": TS_NOW - timedelta(seconds=30),
-            "val": Number(72.2, "kW"),
-        },
-        {
-            "ts": TS_NOW,
-            "val": Number(76.3, "kW"),
-        },
-    ]
+    rows = _his_rows(now, ("ts", "val"), _SINGLE_PT_VAL)
 
     return Grid(meta, cols, rows)
 
 
+def _masked_array(type: pa.DataType, values: np.ndarray, valid: np.ndarray) -> pa.Array:
+    import numpy as np
+    import pyarrow as pa
+
+    # build the Arrow buffers directly; bool values and validity are both bit-packed
+    if pa.types.is_boolean(type):
+        values = np.packbits(values, bitorder="little")
+    validity = np.packbits(valid, bitorder="little")
+    buffers = [pa.py_buffer(validity), pa.py_buffer(values)]
+    return pa.Array.from_buffers(type, len(valid), buffers)
+
+
+def _build_his_table(
+    point_ids: list[str],
+    id_indices: list[int],
+    ts: list[datetime],
+    *val_cols: pa.Array,
+) -> pa.Table:
+    import numpy as np
+    import pyarrow as pa
+
+    schema = expected_schema()
+    id_col = pa.DictionaryArray.from_arrays(
+        np.array(id_indices, dtype=np.int32), pa.array(point_ids, type=pa.string())
+    )
+    ts_col = pa.array(ts, type=schema.field("ts").type)
+
+    return pa.Table.from_arrays([id_col, ts_col, *val_cols], schema=schema)
+
+
 @pytest.fixture(scope="module")
 def single_pt_his_table() -> pa.Table:
-    data = [
-        {
-            "id": "point1",
-            "ts": TS_NOW - timedelta(seconds=60),
-            "val_bool": None,
-            "val_str": None,
-            "val_num": None,
-            "na": True,
-        },
-        {
-            "id": "point1",
-            "ts": TS_NOW - timedelta(seconds=30),
-            "val_bool": None,
-            "val_str": None,
-            "val_num": 72.2,
-            "na": False,
-        },
-        {
-            "id": "point1",
-            "ts": TS_NOW,
-            "val_bool": None,
-            "val_str": None,
-            "val_num": 76.3,
-            "na": False,
-        },
-    ]
-
-    return pa.Table.from_pylist(data, schema=EXPECTED_SCHEMA)
+    import numpy as np
+    import pyarrow as pa
+
+    now = _ts_now()
+
+    return _build_his_table(
+        ["point1"],
+        [0, 0, 0],
+        [now - timedelta(seconds=60), now - timedelta(seconds=30), now],
+        pa.nulls(3, type=pa.bool_()),
+        pa.nulls(3, type=pa.string()),
+        _masked_array(
+            pa.float64(), np.array([0.0, 72.2, 76.3]), np.array([0, 1, 1], np.uint8)
+        ),
+        pa.array([True, False, False], type=pa.bool_()),
+    )
 
 
 @pytest.fixture(scope="module")
 def multi_pt_his_grid() -> Grid:
+    now = _ts_now()
+
     meta = {
         "ver": "3.0",
-        "id": Ref("1234", "foo kW"),
-        "hisStart": TS_NOW - timedelta(hours=1),
-        "hisEnd": TS_NOW,
+        "id": _HIS_GRID_ID,
+        "hisStart": now - timedelta(hours=1),
+        "hisEnd": now,
     }
 
     cols = [
-        GridCol("ts"),
+        _TS_COL,
         GridCol("v0", {"id": Ref("point1", "Power"), "unit": "kW", "kind": "Number"}),
         GridCol("v1", {"id": Ref("point2", "Status"), "kind": "Str"}),
         GridCol("v2", {"id": Ref("point3"), "kind": "Bool"}),
     ]
-    rows = [
-        {
-            "ts": TS_NOW - timedelta(seconds=60),
-            # v0 is None (missing from row)
-            "v1": "available",
-            "v2": True,
-        },
-        {
-            "ts": TS_NOW - timedelta(seconds=30),
-            "v0": NA(),
-            # v1 is None (missing from row)
-            "v2": False,
-        },
-        {
-            "ts": TS_NOW,
-            "v0": Number(76.3, "kW"),
-            "v1": NA(),
-            # v2 is None (missing from row)
-        },
-    ]
+    rows = _his_rows(
+        now, ("ts", "v0", "v1", "v2"), _MULTI_PT_V0, _MULTI_PT_V1, _MULTI_PT_V2
+    )
 
     return Grid(meta, cols, rows)
 
 
 @pytest.fixture(scope="module")
 def multi_pt_his_table() -> pa.Table:
-    data = [
-        {
-            "id": "point1",
-            "ts": TS_NOW - timedelta(seconds=30),
-            "val_bool": None,
-            "val_str": None,
-            "val_num": None,
-            "na": True,
-        },
-        {
-            "id": "point1",
-            "ts": TS_NOW,
-            "val_bool": None,
-            "val_str": None,
-            "val_num": 76.3,
-            "na": False,
-        },
-        {
-            "id": "point2",
-            "ts": TS_NOW - timedelta(seconds=60),
-            "val_bool": None,
-            "val_str": "available",
-            "val_num": None,
-            "na": False,
-        },
-        {
-            "id": "point2",
-            "ts": TS_NOW,
-            "val_bool": None,
-            "val_str": None,
-            "val_num": None,
-            "na": True,
-        },
-        {
-            "id": "point3",
-            "ts": TS_NOW - timedelta(seconds=60),
-            "val_bool": True,
-            "val_str": None,
-            "val_num": None,
-            "na": False,
-        },
-        {
-            "id": "point3",
-            "ts": TS_NOW - timedelta(seconds=30),
-            "val_bool": False,
-            "val_str": None,
-            "val_num": None,
-            "na": False,
-        },
-    ]
+    import numpy as np
+    import pyarrow as pa
+
+    now = _ts_now()
+
+    return _build_his_table(
+        ["point1", "point2", "point3"],
+        [0, 0, 1, 1, 2, 2],
+        [
+            now - timedelta(seconds=30),
+            now,
+            now - timedelta(seconds=60),
+            now,
+            now - timedelta(seconds=60),
+            now - timedelta(seconds=30),
+        ],
+        _masked_array(
+            pa.bool_(),
+            np.array([0, 0, 0, 0, 1, 0], np.uint8),
+            np.array([0, 0, 0, 0, 1, 1], np.uint8),
+        ),
+        pa.array([None, None, "available", None, None, None], type=pa.string()),
+        _masked_array(
+            pa.float64(),
+            np.array([0.0, 76.3, 0.0, 0.0, 0.0, 0.0]),
+            np.array([0, 1, 0, 0, 0, 0], np.uint8),
+        ),
+        pa.array([True, False, False, True, False, False], type=pa.bool_()),
+    )
+
+
+# number of kW point recs created per round-trip by create_kw_pt_rec_fn
+_KW_PT_POOL_SIZE = 8
 
-    return pa.Table.from_pylist(data, schema=EXPECTED_SCHEMA)
+_AXON_CREATE_KW_PT = (
+    f"(1..{_KW_PT_POOL_SIZE}).map(i => diff(null, {{hisTest, pytest, point, his, "
+    f'tz: "New_York", writable, kind: "Number", unit: "kW"}}, {{add}})).commit'
+)
+_AXON_TRASH_RECS = "readByIds([{ids}]).toRecList.map(r => diff(r, {{trash}})).commit"
 
 
 @pytest.fixture(scope="module")
 def create_kw_pt_rec_fn(
     client: HaxallClient,
 ) -> Generator[Callable[[], dict[str, Any]], None, None]:
-    axon_expr = (
-        """diff(null, {hisTest, pytest, point, his, tz: "New_York", writable, """
-        """kind: "Number", unit: "kW"}, {add}).commit"""
-    )
+    pt_recs: deque[Mapping[str, Any]] = deque()
     created_pt_ids: list[Ref] = []
 
     def _create_pt_rec() -> Mapping[str, Any]:
-        response = client.eval(axon_expr)
-        pt_rec = response.rows[0]
-        created_pt_ids.append(pt_rec["id"])
-        return pt_rec
+        if not pt_recs:
+            response = client.eval(_AXON_CREATE_KW_PT)
+            pt_recs.extend(response.rows)
+            created_pt_ids.extend(pt_rec["id"] for pt_rec in response.rows)
+        return pt_recs.popleft()
 
     yield _create_pt_rec
 
-    for pt_id in created_pt_ids:
-        axon_expr = f"readById(@{pt_id.val}).diff({{trash}}).commit"
-        client.eval(axon_expr)
+    if created_pt_ids:
+        ids = ", ".join(f"@{pt_id.val}" for pt_id in created_pt_ids)
+        client.eval(_AXON_TRASH_RECS.format(ids=ids))
 
 
 @pytest.fixture(scope="module")
-def point_id_with_his_data(
+def point_id_with_his_data_factory(
     client: HaxallClient, create_kw_pt_rec_fn: Callable[[], dict[str, Any]]
-) -> Generator[tuple[Ref, list[dict[str, Any]]], None, None]:
-    test_pt_rec = create_kw_pt_rec_fn()
+) -> Generator[Callable[[int], list[tuple[Ref, list[dict[str, Any]]]]], None, None]:
+    # numpy ships with the pandas and pyarrow dev dependencies, so it is only imported
+    # by the fixtures that need it
+    import numpy as np
 
-    ts_now = datetime.now(ZoneInfo("America/New_York"))
+    # seeded so generated his data is reproducible between runs
+    rng = np.random.default_rng(0)
+    created_pts: list[tuple[Ref, list[dict[str, Any]]]] = []
 
-    rows = [
-        {
-            "ts": ts_now - timedelta(seconds=30),
-            "v0": Number(random.randint(70, 80), "kW"),
-        },
-        {
-            "ts": ts_now,
-            "v0": Number(random.randint(70, 80), "kW"),
-        },
-    ]
+    def _get_pts(count: int) -> list[tuple[Ref, list[dict[str, Any]]]]:
+        # points are only created when more are requested than already exist
+        new_count = count - len(created_pts)
+        if new_count > 0:
+            pt_ids = [create_kw_pt_rec_fn()["id"] for _ in range(new_count)]
+
+            # every point shares the same timestamps so batch reads line up by row
+            now = _ts_now()
+            ts_list = [now - timedelta(seconds=30), now]
+            vals = rng.integers(70, 81, size=(new_count, len(ts_list)))
+
+            # the history for every new point is sent in a single hisWrite request
+            his_rows = [
+                {"ts": ts}
+                | {f"v{i}": Number(int(val), "kW") for i, val in enumerate(col)}
+                for ts, col in zip(ts_list, vals.T)
+            ]
+            client.his_write_by_ids(pt_ids, his_rows)
+
+            for i, pt_id in enumerate(pt_ids):
+                rows = [{"ts": row["ts"], "v0": row[f"v{i}"]} for row in his_rows]
+                created_pts.append((pt_id, rows))
+
+        return created_pts[:count]
 
-    client.his_write_by_ids([test_pt_rec["id"]], rows)
+    yield _get_pts
 
-    yield (test_pt_rec["id"], rows)
+
+@pytest.fixture(scope="module")
+def point_id_with_his_data(
+    point_id_with_his_data_factory: Callable[
+        [int], list[tuple[Ref, list[dict[str, Any]]]]
+    ],
+) -> tuple[Ref, list[dict[str, Any]]]:
+    return point_id_with_his_data_factory(1)[0]
+
+
+@pytest.fixture(
+    params=["date_today", "date_slice_7d", "dt_today", "dt_slice_3d"], scope="module"
+)
+def his_grid_for_range(
+    request,
+    client: HaystackClient,
+    point_id_with_his_data: tuple[Ref, list[dict[str, Any]]],
+    today: date,
+) -> tuple[Grid, date | DateRange | DateTimeRange]:
+    # one his read per range shape, shared by every test asserting on that range
+    point_ref, _ = point_id_with_his_data
+
+    if request.param == "date_today":
+        # a plain date goes through his_read_by_id to keep the single id op covered
+        return client.his_read_by_id(point_ref, today), today
+
+    his_range: DateRange | DateTimeRange
+    match request.param:
+        case "date_slice_7d":
+            his_range = DateRange(today - timedelta(days=7), today)
+        case "dt_today":
+            his_range = DateTimeRange(
+                midnight_ny(), midnight_ny(hour=23, minute=59, second=59)
+            )
+        case "dt_slice_3d":
+            his_range = DateTimeRange(
+                midnight_ny(-3), midnight_ny(hour=23, minute=59, second=59)
+            )
+        case _:
+            raise ValueError(f"Unknown his range {request.param}")
+
+    return client.his_read_by_ids(point_ref, his_range), his_range
 
 
 @pytest.fixture
 def sample_recs() -> list[dict[str, Any]]:
     data = [
-        {"dis": "Rec1...", "testing": Marker()},
-        {"dis": "Rec2...", "testing": Marker()},
+        {"dis": "Rec1...", "testing": _MARKER},
+        {"dis": "Rec2...", "testing": _MARKER},
     ]
     return data
 
@@ -294,13 +545,8 @@ def sample_recs() -> list[dict[str, Any]]:
 def create_pt_that_is_not_removed_fn(
     client: HaxallClient,
 ) -> Generator[Callable[[], dict[str, Any]], None, None]:
-    axon_expr = (
-        """diff(null, {pytest, point, his, tz: "New_York", writable, """
-        """kind: "Number"}, {add}).commit"""
-    )
-
     def _create_pt():
-        response = client.eval(axon_expr)
+        response = client.eval(AXON_CREATE_PT)
         writable_kw_pt_rec = response.rows[0]
         return writable_kw_pt_rec
 
@@ -1,6 +1,8 @@
 # flake8: noqa
 
 from datetime import datetime
+from email.message import Message
+from operator import itemgetter
 from typing import Any, Callable, Generator, Sequence, Mapping
 from urllib.error import HTTPError
 import pytest
@@ -16,133 +18,44 @@ from phable import (
     UnknownRecError,
     open_haxall_client,
 )
+from phable.http import PhHttpResponse
+from phable.io.json_encoder import JsonEncoder
+from tests._fixtures_common import AXON_CREATE_PT
 
-@pytest.mark.order(0)
-@pytest.mark.parametrize("client", ["json"], indirect=True)
-def test_configure_proj(client: HaxallClient):
-    data = [
-        {
-            "id": Ref("ph-001"),
-            "site": Marker(),
-            "pytest": Marker(),
-            "dis": "Carytown",
-            "geoState": "VA",
-        },
-        {
-            "id": Ref("ph-002"),
-            "siteRef": Ref("ph-001"),
-            "equip": Marker(),
-            "pytest": Marker(),
-            "siteMeter": Marker(),
-            "dis": "Elec-Meter-01",
-            "elec": Marker(),
-            "meter": Marker(),
-        },
-        {
-            "id": Ref("ph-003"),
-            "siteRef": Ref("ph-001"),
-            "equipRef": Ref("ph-002"),
-            "point": Marker(),
-            "pytest": Marker(),
-            "his": Marker(),
-            "demand": Marker(),
-            "navName": "kW",
-            "kind": "Number",
-            "unit": "kW",
-            "tz": "New_York",
-        },
-        {
-            "id": Ref("ph-004"),
-            "siteRef": Ref("ph-001"),
-            "equipRef": Ref("ph-002"),
-            "point": Marker(),
-            "pytest": Marker(),
-            "his": Marker(),
-            "demand": Marker(),
-            "navName": "kW",
-            "kind": "Number",
-            "unit": "kW",
-            "tz": "New_York",
-        },
-    ]
-
-    try:
-        client.commit_add(data)
-    except CallError as e:
-        if "Rec already exists" in e.help_msg.meta["errTrace"]:
-            print("Previous test records still in database, clearing then re-adding")
-            clear_test_data(client)
-            client.commit_add(data)
-        else:
-            raise e
-
-    try:
-        client.eval('libAdd("hx.point")')
-    except CallError as e:
-        if "Lib already enabled: hx.point" not in e.help_msg.meta["errTrace"]:
-            raise e
-
-    point_count = client.eval("readCount(point and pytest)").rows[0]["val"].val
-    equip_count = client.eval("readCount(equip and pytest)").rows[0]["val"].val
-    site_count = client.eval("readCount(site and pytest)").rows[0]["val"].val
-
-    if point_count != 2:
-        raise ValueError(
-            f"Unexpected number of pytest points in database. {point_count} != 2"
-        )
-    if equip_count != 1:
-        raise ValueError(
-            f"Unexpected number of pytest equips in database. {equip_count} != 1"
-        )
-    if site_count != 1:
-        raise ValueError(
-            f"Unexpected number of pytest sites in database. {site_count} != 1"
-        )
+_EMPTY_COLS = [GridCol("empty")]
+_EMPTY_META = {"ver": "3.0"}
 
 
-@pytest.mark.order(-1)
-@pytest.mark.parametrize("client", ["json"], indirect=True)
-def test_teardown_proj(client: HaxallClient):
-    clear_test_data(client)
+def test_about_op_with_trailing_uri_slash(
+    URI: str, trailing_slash_client: HaxallClient
+):
+    assert trailing_slash_client.uri == URI
+    assert trailing_slash_client.about()["vendorName"] == "SkyFoundry"
 
-    point_count = client.eval("readCount(point and pytest)").rows[0]["val"].val
-    equip_count = client.eval("readCount(equip and pytest)").rows[0]["val"].val
-    site_count = client.eval("readCount(site and pytest)").rows[0]["val"].val
 
-    if point_count != 0:
-        raise ValueError(
-            f"Unexpected number of pytest points in database. {point_count} != 0"
-        )
-    if equip_count != 0:
-        raise ValueError(
-            f"Unexpected number of pytest equips in database. {equip_count} != 0"
-        )
-    if site_count != 0:
-        raise ValueError(
-            f"Unexpected number of pytest sites in database. {site_count} != 0"
-        )
+def test_about_op_with_trailing_uri_slash_using_context(
+    URI: str, USERNAME: str, PASSWORD: str, monkeypatch: pytest.MonkeyPatch
+):
+    requested_urls: list[str] = []
 
+    def _ph_request(url: str, *args, **kwargs) -> PhHttpResponse:
+        requested_urls.append(url)
+        empty_grid = Grid({"ver": "3.0"}, [GridCol("empty")], [])
+        return PhHttpResponse(JsonEncoder().encode(empty_grid), Message(), 200)
 
-def clear_test_data(client: HaxallClient):
-    client.eval(
-        "readAll((site or point or equip) and pytest).toRecList.map(r=> diff(r, null, {remove})).commit()"
+    monkeypatch.setattr(
+        HaxallClient, "open", classmethod(lambda cls, uri, *_, **__: cls(uri, "s-x"))
     )
+    monkeypatch.setattr("phable.haystack_client.ph_request", _ph_request)
 
-
-def test_about_op_with_trailing_uri_slash(URI: str, USERNAME: str, PASSWORD: str):
-    client = HaxallClient.open(URI + "/", USERNAME, PASSWORD)
-    assert client.about()["vendorName"] == "SkyFoundry"
-    client.close()
-
-
-def test_about_op_with_trailing_uri_slash_using_context(
-    URI: str, USERNAME: str, PASSWORD: str
-):
     with open_haxall_client(URI + "/", USERNAME, PASSWORD) as client:
-        assert client.about()["vendorName"] == "SkyFoundry"
+        assert client.uri == URI
+        assert requested_urls == []
+
+    assert requested_urls == [f"{URI}/close"]
 
 
-def test_open_hx_client(URI: str, USERNAME: str, PASSWORD: str):
+def test_open_hx_client(haxall_test_proj: None, URI: str, USERNAME: str, PASSWORD: str):
     with open_haxall_client(URI, USERNAME, PASSWORD) as hc:
         auth_token = hc._auth_token
 
@@ -166,17 +79,12 @@ def test_commit_add_one_rec(client: HaxallClient, sample_recs: list[dict[str, An
     data = sample_recs[0].copy()
     response = client.commit_add(data)
 
-    actual_keys = list(response.rows[0].keys())
-    actual_keys.sort()
-    expected_keys = list(data.keys()) + ["id", "mod"]
-    expected_keys.sort()
-
-    assert actual_keys == expected_keys
+    assert set(response.rows[0].keys()) == {*data.keys(), "id", "mod"}
     assert response.rows[0]["dis"] == data["dis"]
     assert response.rows[0]["testing"] == data["testing"]
     assert isinstance(response.rows[0]["id"], Ref)
 
-    client.commit_remove(Grid.to_grid(response.rows))
+    client.commit_remove(response.rows)
 
 
 def test_commit_add_multiple_recs(
@@ -186,12 +94,7 @@ def test_commit_add_multiple_recs(
     response = client.commit_add(data)
 
     for row in response.rows:
-        actual_keys = list(row.keys())
-        actual_keys.sort()
-        expected_keys = ["dis", "testing", "id", "mod"]
-        expected_keys.sort()
-
-        assert actual_keys == expected_keys
+        assert set(row.keys()) == {"dis", "testing", "id", "mod"}
         assert row["testing"] == Marker()
 
     assert response.rows[0]["dis"] == sample_recs[0]["dis"]
@@ -199,7 +102,7 @@ def test_commit_add_multiple_recs(
     assert isinstance(response.rows[0]["id"], Ref)
     assert isinstance(response.rows[1]["id"], Ref)
 
-    client.commit_remove(Grid.to_grid(response.rows))
+    client.commit_remove(response.rows)
 
 
 def test_commit_add_multiple_recs_as_grid(
@@ -209,12 +112,7 @@ def test_commit_add_multiple_recs_as_grid(
     response = client.commit_add(Grid.to_grid(data))
 
     for row in response.rows:
-        actual_keys = list(row.keys())
-        actual_keys.sort()
-        expected_keys = ["dis", "testing", "id", "mod"]
-        expected_keys.sort()
-
-        assert actual_keys == expected_keys
+        assert set(row.keys()) == {"dis", "testing", "id", "mod"}
         assert row["testing"] == Marker()
 
     assert response.rows[0]["dis"] == sample_recs[0]["dis"]
@@ -222,7 +120,7 @@ def test_commit_add_multiple_recs_as_grid(
     assert isinstance(response.rows[0]["id"], Ref)
     assert isinstance(response.rows[1]["id"], Ref)
 
-    client.commit_remove(Grid.to_grid(response.rows))
+    client.commit_remove(response.rows)
 
 
 def test_commit_add_with_new_id_does_not_raise_error(
@@ -298,15 +196,16 @@ def test_commit_update_with_multiple_recs_as_grid(
 def assert_commit_update_recs_sent_and_recv_match(
     recs_sent: Sequence[Mapping[str, Any]], recs_recv: Sequence[Mapping[str, Any]]
 ) -> None:
-    for count, rec_sent in enumerate(recs_sent):
-        rec_recv = recs_recv[count]
-        for key in rec_recv.keys():
-            if key == "mod":
-                assert rec_recv[key] > rec_sent[key]
-            elif key == "writeLevel":
-                assert rec_recv[key] == Number(17)
-            else:
-                assert rec_sent[key] == rec_recv[key]
+    for rec_sent, rec_recv in zip(recs_sent, recs_recv, strict=True):
+        cmp_keys = tuple(key for key in rec_recv if key not in ("mod", "writeLevel"))
+        if cmp_keys:
+            get_cmp_vals = itemgetter(*cmp_keys)
+            assert get_cmp_vals(rec_sent) == get_cmp_vals(rec_recv)
+
+        if "mod" in rec_recv:
+            assert rec_recv["mod"] > rec_sent["mod"]
+        if "writeLevel" in rec_recv:
+            assert rec_recv["writeLevel"] == Number(17)
 
 
 def test_commit_update_recs_with_only_id_and_mod_tags_sent(
@@ -391,8 +290,8 @@ def test_commit_remove_with_id_and_mod_rec_tags(
 
     # verify it returns an empty Grid
     assert response.rows == []
-    assert response.cols == [GridCol("empty")]
-    assert response.meta == {"ver": "3.0"}
+    assert response.cols == _EMPTY_COLS
+    assert response.meta == _EMPTY_META
 
     with pytest.raises(UnknownRecError):
         client.read_by_id(pt_rec1["id"])
@@ -418,8 +317,8 @@ def test_commit_remove_with_id_and_mod_rec_tags_as_grid(
 
     # verify it returns an empty Grid
     assert response.rows == []
-    assert response.cols == [GridCol("empty")]
-    assert response.meta == {"ver": "3.0"}
+    assert response.cols == _EMPTY_COLS
+    assert response.meta == _EMPTY_META
 
     with pytest.raises(UnknownRecError):
         client.read_by_id(pt_rec1["id"])
@@ -436,8 +335,8 @@ def test_commit_remove_one_rec(
     response = client.commit_remove(pt_rec)
 
     assert response.rows == []
-    assert response.cols == [GridCol("empty")]
-    assert response.meta == {"ver": "3.0"}
+    assert response.cols == _EMPTY_COLS
+    assert response.meta == _EMPTY_META
 
     with pytest.raises(UnknownRecError):
         client.read_by_id(pt_rec["id"])
@@ -453,8 +352,8 @@ def test_commit_remove_with_all_rec_tags(
 
     # verify it returns an empty Grid
     assert response.rows == []
-    assert response.cols == [GridCol("empty")]
-    assert response.meta == {"ver": "3.0"}
+    assert response.cols == _EMPTY_COLS
+    assert response.meta == _EMPTY_META
 
     with pytest.raises(UnknownRecError):
         client.read_by_id(pt_rec1["id"])
@@ -478,12 +377,7 @@ def test_commit_remove_with_non_existing_rec(
 
 
 def test_eval(client: HaxallClient):
-    axon_expr = (
-        """diff(null, {pytest, point, his, tz: "New_York", writable, """
-        """kind: "Number"}, {add}).commit"""
-    )
-
-    response = client.eval(axon_expr)
+    response = client.eval(AXON_CREATE_PT)
     assert "id" in response.rows[0].keys()
     assert "mod" in response.rows[0].keys()
 
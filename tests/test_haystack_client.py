@@ -1,7 +1,6 @@
 from datetime import date, datetime, timedelta
 from typing import Any, Callable
 from urllib.error import HTTPError, URLError
-from zoneinfo import ZoneInfo
 
 import pytest
 
@@ -67,7 +66,7 @@ def test_open_client(URI: str, USERNAME: str, PASSWORD: str):
 
 def test_close_op(URI: str, USERNAME: str, PASSWORD: str):
     client = HaystackClient.open(URI, USERNAME, PASSWORD)
-    assert len(client.close().rows) == 0
+    assert client.close().is_empty
 
 
 # -----------------------------------------------------------------------------
@@ -80,15 +79,8 @@ def test_about_op(client: HaystackClient):
 
 
 def test_about_op_with_trailing_uri_slash(URI: str, USERNAME: str, PASSWORD: str):
-    client = HaystackClient.open(URI + "/", USERNAME, PASSWORD)
-    assert client.about()["vendorName"] == "SkyFoundry"
-    client.close()
-
-
-def test_about_op_with_trailing_uri_slash_using_context(
-    URI: str, USERNAME: str, PASSWORD: str
-):
     with open_haystack_client(URI + "/", USERNAME, PASSWORD) as client:
+        assert client.uri == URI
         assert client.about()["vendorName"] == "SkyFoundry"
 
 
@@ -114,8 +106,8 @@ def test_read_point(client: HaystackClient):
     assert isinstance(grid["demand"], Marker)
 
 
-def test_read_by_id(client: HaystackClient):
-    id1 = client.read("point and demand and equipRef->siteMeter")["id"]
+def test_read_by_id(demand_points_grid: Grid, client: HaystackClient):
+    id1 = demand_points_grid.rows[0]["id"]
     response = client.read_by_id(id1)
 
     assert response["navName"] == "kW"
@@ -127,10 +119,9 @@ def test_read_by_id(client: HaystackClient):
     assert len(checked_response) == 0
 
 
-def test_read_by_ids(client: HaystackClient):
-    ids = client.read_all("point and demand and equipRef->siteMeter")
-    id1 = ids.rows[0]["id"]
-    id2 = ids.rows[1]["id"]
+def test_read_by_ids(demand_points_grid: Grid, client: HaystackClient):
+    id1 = demand_points_grid.rows[0]["id"]
+    id2 = demand_points_grid.rows[1]["id"]
 
     response = client.read_by_ids([id1, id2])
 
@@ -147,12 +138,15 @@ def test_read_by_ids(client: HaystackClient):
         client.read_by_ids([Ref("invalid-id1"), Ref("invalid-id2")])
 
 
+@pytest.mark.xdist_group("writes")
 def test_single_his_write_by_id(
-    create_kw_pt_rec_fn: Callable[[], dict[str, Any]], client: HaystackClient
+    create_kw_pt_rec_fn: Callable[[], dict[str, Any]],
+    client: HaystackClient,
+    today: date,
+    ts_now: datetime,
 ):
     test_pt_rec = create_kw_pt_rec_fn()
 
-    ts_now = datetime.now(ZoneInfo("America/New_York"))
     rows = [
         {
             "ts": ts_now - timedelta(seconds=30),
@@ -167,10 +161,9 @@ def test_single_his_write_by_id(
     # write the his data to the test pt
     response = client.his_write_by_id(test_pt_rec["id"], rows)
 
-    assert len(response.rows) == 0
+    assert response.is_empty
 
-    date_range = date.today()
-    his_grid = client.his_read_by_ids(test_pt_rec["id"], date_range)
+    his_grid = client.his_read_by_ids(test_pt_rec["id"], today)
 
     expected_values = [
         (0, 72.2, "kW"),
@@ -184,12 +177,12 @@ def test_single_his_write_by_id(
 def test_batch_his_write_by_ids(
     point_id_with_his_data: tuple[Ref, list[dict[str, Any]]],
     client: HaystackClient,
+    today: date,
 ):
     test_rec_id_1, data_1 = point_id_with_his_data
     test_rec_id_2, data_2 = point_id_with_his_data
 
-    date_range = date.today()
-    his_grid = client.his_read_by_ids([test_rec_id_1, test_rec_id_2], date_range)
+    his_grid = client.his_read_by_ids([test_rec_id_1, test_rec_id_2], today)
 
     for index in range(len(his_grid.rows)):
         assert his_grid.rows[index]["v0"].val == pytest.approx(data_1[index]["v0"].val)
@@ -202,162 +195,60 @@ def test_batch_his_write_by_ids(
         )
 
 
-def test_his_read_by_id_with_date_range(
-    point_id_with_his_data: tuple[Ref, list[dict[str, Any]]],
-    client: HaystackClient,
+def test_his_read_with_range(
+    his_grid_for_range: tuple[Grid, date | DateRange | DateTimeRange], today: date
 ):
-    test_rec_id, _ = point_id_with_his_data
-
-    # get the his using Date as the range
-    start = date.today()
-    his_grid = client.his_read_by_id(test_rec_id, start)
-
-    # check his_grid
-    cols = [col.name for col in his_grid.cols]
-    assert isinstance(his_grid.rows[0][cols[1]], Number)
-    assert his_grid.rows[0][cols[1]].unit == "kW"
-    assert his_grid.rows[0][cols[1]].val >= 0
-    assert his_grid.rows[0][cols[0]].date() == start
-    assert his_grid.rows[-1][cols[0]].date() == start
-
-
-def test_his_read_by_ids_with_date_range(
-    point_id_with_his_data: tuple[Ref, list[dict[str, Any]]], client: HaystackClient
-):
-    # find the point ids
-    point_ref1, _ = point_id_with_his_data
-    point_ref2, _ = point_id_with_his_data
-
-    # get the his using Date as the range
-    start = date.today()
-    his_grid = client.his_read_by_ids([point_ref1, point_ref2], start)
-
-    # check his_grid
-    cols = [col.name for col in his_grid.cols]
-    assert isinstance(his_grid.rows[0][cols[1]], Number)
-    assert his_grid.rows[0][cols[1]].unit == "kW"
-    assert his_grid.rows[0][cols[1]].val >= 0
-    assert his_grid.rows[0][cols[0]].date() == start
-    assert his_grid.rows[1][cols[1]].unit == "kW"
-    assert his_grid.rows[1][cols[1]].val >= 0
-    assert his_grid.rows[1][cols[0]].date() == start
-    assert his_grid.rows[-1][cols[0]].date() == start
-
-
-def test_his_read_by_ids_with_datetime_range(
-    point_id_with_his_data: tuple[Ref, list[dict[str, Any]]], client: HaystackClient
-):
-    # find the point ids
-    point_ref, _ = point_id_with_his_data
-    ts_now = datetime.now(ZoneInfo("America/New_York"))
-
-    # get the his using Date as the range
-    datetime_range = DateTimeRange(
-        datetime(
-            ts_now.year,
-            ts_now.month,
-            ts_now.day,
-            0,
-            0,
-            0,
-            tzinfo=ZoneInfo("America/New_York"),
-        ),
-        datetime(
-            ts_now.year,
-            ts_now.month,
-            ts_now.day,
-            23,
-            59,
-            59,
-            tzinfo=ZoneInfo("America/New_York"),
-        ),
-    )
-    his_grid = client.his_read_by_ids(point_ref, datetime_range)
+    his_grid, his_range = his_grid_for_range
 
     # check his_grid
-    cols = [col.name for col in his_grid.cols]
-    assert isinstance(his_grid.rows[0][cols[1]], Number)
-    assert his_grid.rows[0][cols[1]].unit == "kW"
-    assert his_grid.rows[0][cols[1]].val >= 0
-    assert his_grid.rows[0][cols[0]].date() == datetime_range.start.date()
-    assert his_grid.rows[-1][cols[0]].date() == date.today()
-
-
-def test_his_read_by_ids_with_date_slice(
-    point_id_with_his_data: tuple[Ref, list[dict[str, Any]]], client: HaystackClient
-):
-    # find the point id
-    point_ref, _ = point_id_with_his_data
-
-    # get the his using Date as the range
-    start = date.today() - timedelta(days=7)
-    end = date.today()
-    date_range = DateRange(start, end)
-    his_grid = client.his_read_by_ids(point_ref, date_range)
-
-    # check his_grid
-    cols = [col.name for col in his_grid.cols]
-    assert isinstance(his_grid.rows[0][cols[1]], Number)
-    assert his_grid.rows[0][cols[1]].unit == "kW"
-    assert his_grid.rows[0][cols[1]].val >= 0
-    assert his_grid.meta["hisStart"].date() == start
-    # hisEnd on a his read always goes to midnight of the end date which resolves as tomorrow in date()
-    assert his_grid.meta["hisEnd"].date() == end + timedelta(days=1)
-
-
-def test_his_read_by_ids_with_datetime_slice(
-    point_id_with_his_data: tuple[Ref, list[dict[str, Any]]], client: HaystackClient
-):
-    # find the point id
-    point_ref, _ = point_id_with_his_data
-
-    # get the his using Date as the range
-    ts_now = datetime.now(ZoneInfo("America/New_York"))
-    date_now = datetime(
-        ts_now.year,
-        ts_now.month,
-        ts_now.day,
-        0,
-        0,
-        0,
-        tzinfo=ZoneInfo("America/New_York"),
-    )
-    start = date_now - timedelta(days=3)
-    end = date_now + timedelta(hours=23, minutes=59, seconds=59)
-
-    datetime_range = DateTimeRange(start, end)
-
-    his_grid = client.his_read_by_ids(point_ref, datetime_range)
-
-    # check his_grid
-    cols = [col.name for col in his_grid.cols]
-    assert isinstance(his_grid.rows[0][cols[1]], Number)
-    assert his_grid.rows[0][cols[1]].unit == "kW"
-    assert his_grid.rows[0][cols[1]].val >= 0
-    assert his_grid.meta["hisStart"].date() == start.date()
-    assert his_grid.meta["hisEnd"].date() == end.date()
-
-
+    ts_col, val_col = [col.name for col in his_grid.cols][:2]
+
+    vals = his_grid.column(val_col)
+    assert all(isinstance(v, Number) and v.unit == "kW" for v in vals)
+    assert min(v.val for v in vals) >= 0
+    assert his_grid.rows[-1][ts_col].date() == today
+
+    his_start = his_grid.meta["hisStart"].date()
+    his_end = his_grid.meta["hisEnd"].date()
+    match his_range:
+        case DateTimeRange():
+            assert his_start == his_range.start.date()
+            assert his_end == his_range.end.date()
+        case DateRange():
+            assert his_start == his_range.start
+            # hisEnd on a his read always goes to midnight of the end date which resolves as tomorrow in date()
+            assert his_end == his_range.end + timedelta(days=1)
+        case date():
+            assert his_grid.rows[0][ts_col].date() == his_range
+            assert his_start == his_range
+            assert his_end == his_range + timedelta(days=1)
+        case _:
+            pytest.fail(f"No assertions defined for his range {his_range!r}")
+
+
+@pytest.mark.xdist_group("writes")
 def test_batch_his_read_by_ids(
-    point_id_with_his_data: tuple[Ref, list[dict[str, Any]]], client: HaystackClient
+    point_id_with_his_data_factory: Callable[
+        [int], list[tuple[Ref, list[dict[str, Any]]]]
+    ],
+    client: HaystackClient,
+    today: date,
 ):
-    ids = []
-    for _ in range(4):
-        new_id, _ = point_id_with_his_data
-        ids.append(new_id)
+    ids = [pt_id for pt_id, _ in point_id_with_his_data_factory(4)]
+
+    his_grid = client.his_read_by_ids(ids, today)
 
-    his_grid = client.his_read_by_ids(ids, date.today())
+    ts_col, *val_cols = [col.name for col in his_grid.cols]
 
-    cols = [col.name for col in his_grid.cols]
-    assert isinstance(his_grid.rows[0][cols[0]], datetime)
-    assert isinstance(his_grid.rows[0][cols[1]], Number)
-    assert his_grid.rows[0][cols[1]].unit == "kW"
-    assert his_grid.rows[0][cols[1]].val >= 0
-    assert isinstance(his_grid.rows[0][cols[4]], Number)
-    assert his_grid.rows[0][cols[4]].unit == "kW"
-    assert his_grid.rows[0][cols[4]].val >= 0
+    assert len(val_cols) == len(ids)
+    assert all(isinstance(ts, datetime) for ts in his_grid.column(ts_col))
+    for val_col in val_cols:
+        vals = his_grid.column(val_col)
+        assert all(isinstance(v, Number) and v.unit == "kW" for v in vals)
+        assert min(v.val for v in vals) >= 0
 
 
+@pytest.mark.xdist_group("writes")
 def test_point_write_number(
     create_kw_pt_rec_fn: Callable[[], dict[str, Any]], client: HaystackClient
 ):
@@ -367,9 +258,10 @@ def test_point_write_number(
     assert isinstance(response, Grid)
     assert response.meta["ok"] == Marker()
     assert response.cols[0].name == "empty"
-    assert response.rows == []
+    assert response.is_empty
 
 
+@pytest.mark.xdist_group("writes")
 def test_point_write_number_who(
     create_kw_pt_rec_fn: Callable[[], dict[str, Any]], client: HaystackClient
 ):
@@ -379,7 +271,7 @@ def test_point_write_number_who(
     assert isinstance(response, Grid)
     assert response.meta["ok"] == Marker()
     assert response.cols[0].name == "empty"
-    assert response.rows == []
+    assert response.is_empty
 
     check_response = client.point_write_array(pt_rec["id"])
     check_row = check_response.rows[0]
@@ -389,6 +281,7 @@ def test_point_write_number_who(
     assert "expires" not in check_row.keys()
 
 
+@pytest.mark.xdist_group("writes")
 def test_point_write_number_who_dur(
     create_kw_pt_rec_fn: Callable[[], dict[str, Any]], client: HaystackClient
 ):
@@ -400,7 +293,7 @@ def test_point_write_number_who_dur(
     assert isinstance(response, Grid)
     assert response.meta["ok"] == Marker()
     assert response.cols[0].name == "empty"
-    assert response.rows == []
+    assert response.is_empty
 
     check_response = client.point_write_array(pt_rec["id"])
     check_row = check_response.rows[7]
@@ -412,6 +305,7 @@ def test_point_write_number_who_dur(
     assert expires.val > 4.0 and expires.val < 5.0
 
 
+@pytest.mark.xdist_group("writes")
 def test_point_write_null(
     create_kw_pt_rec_fn: Callable[[], dict[str, Any]], client: HaystackClient
 ):
@@ -421,9 +315,10 @@ def test_point_write_null(
     assert isinstance(response, Grid)
     assert response.meta["ok"] == Marker()
     assert response.cols[0].name == "empty"
-    assert response.rows == []
+    assert response.is_empty
 
 
+@pytest.mark.xdist_group("writes")
 def test_point_write_array(
     create_kw_pt_rec_fn: Callable[[], dict[str, Any]], client: HaystackClient
 ):
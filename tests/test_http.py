@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import gzip
+import threading
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
+
+import pytest
+
+from phable.http import PhConnectionPool, ph_request
+
+
+class _Server(ThreadingHTTPServer):
+    client_ports: list[int]
+    bodies: list[bytes]
+    closed: threading.Event
+
+    def shutdown_request(self, request):
+        super().shutdown_request(request)
+        self.closed.set()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _Server
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.do_POST()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.client_ports.append(self.client_address[1])
+        self.server.bodies.append(body)
+
+        # the request is received but the connection drops before a response is sent
+        if self.path == "/drop":
+            self.close_connection = True
+            return
+
+        status = {"/forbidden": 403, "/moved": 302}.get(self.path, 200)
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+        # the response advertises keep-alive but the server closes the idle socket
+        if self.path == "/close-idle":
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server() -> Generator[_Server, None, None]:
+    server = _Server(("127.0.0.1", 0), _Handler)
+    server.client_ports = []
+    server.bodies = []
+    server.closed = threading.Event()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def server_url(server: _Server) -> tuple[str, list[int]]:
+    return f"http://127.0.0.1:{server.server_port}", server.client_ports
+
+
+def test_pool_reuses_connection(server_url: tuple[str, list[int]]):
+    url, client_ports = server_url
+    pool = PhConnectionPool()
+
+    for data in [b"a", b"b", b"c"]:
+        res = ph_request(url + "/", {}, "text/plain", data, "POST", pool=pool)
+        assert res.status == 200
+        assert res.body == data
+
+    pool.close()
+
+    assert len(client_ports) == 3
+    assert len(set(client_ports)) == 1
+
+
+def test_pool_is_thread_safe(server_url: tuple[str, list[int]]):
+    url, client_ports = server_url
+    pool = PhConnectionPool(maxsize=4)
+    data = [str(i).encode() for i in range(16)]
+
+    def _post(x: bytes) -> bytes:
+        return ph_request(url + "/", {}, "text/plain", x, "POST", pool=pool).body
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(_post, data)) == data
+
+    pool.close()
+
+    assert len(client_ports) == 16
+    assert len(set(client_ports)) <= 4
+
+
+def test_pool_discards_idle_connection_closed_by_server(server: _Server):
+    url = f"http://127.0.0.1:{server.server_port}/close-idle"
+    pool = PhConnectionPool()
+
+    assert ph_request(url, {}, "text/plain", b"a", "POST", pool=pool).body == b"a"
+    assert server.closed.wait(timeout=5)
+    assert ph_request(url, {}, "text/plain", b"b", "POST", pool=pool).body == b"b"
+
+    pool.close()
+
+    assert server.bodies == [b"a", b"b"]
+    assert len(set(server.client_ports)) == 2
+
+
+def test_pool_does_not_resend_post_on_dropped_connection(server: _Server):
+    url = f"http://127.0.0.1:{server.server_port}"
+    pool = PhConnectionPool()
+
+    ph_request(url + "/", {}, "text/plain", b"first", "POST", pool=pool)
+    with pytest.raises(URLError):
+        ph_request(url + "/drop", {}, "text/plain", b"add-rec", "POST", pool=pool)
+
+    pool.close()
+
+    assert server.bodies == [b"first", b"add-rec"]
+
+
+def test_pool_retries_get_once_on_dropped_connection(server: _Server):
+    url = f"http://127.0.0.1:{server.server_port}"
+    pool = PhConnectionPool()
+
+    ph_request(url + "/", {}, "text/plain", pool=pool)
+    with pytest.raises(URLError):
+        ph_request(url + "/drop", {}, "text/plain", pool=pool)
+
+    pool.close()
+
+    # one request on the reused connection and a single retry on a new one
+    assert len(server.client_ports) == 3
+    assert len(set(server.client_ports[1:])) == 2
+
+
+def test_gzip_response_is_decompressed(server_url: tuple[str, list[int]]):
+    url, _ = server_url
+    data = b'ver:"3.0"\nempty\n' * 100
+
+    res = ph_request(url + "/", {}, "text/plain", data, "POST")
+    assert res.headers["Content-Encoding"] == "gzip"
+    assert res.body == data
+
+    pool = PhConnectionPool()
+    assert ph_request(url + "/", {}, "text/plain", data, "POST", pool=pool).body == data
+    pool.close()
+
+
+@pytest.mark.parametrize("pool", [PhConnectionPool(), None])
+def test_raises_http_error_with_decompressed_body(
+    server_url: tuple[str, list[int]], pool: PhConnectionPool | None
+):
+    url, _ = server_url
+
+    with pytest.raises(HTTPError) as e:
+        ph_request(url + "/forbidden", {}, "text/plain", b"x", "POST", pool=pool)
+
+    assert e.value.status == 403
+    assert e.value.read() == b"x"
+
+    if pool is not None:
+        pool.close()
+
+
+def test_pool_raises_http_error_on_redirect(server_url: tuple[str, list[int]]):
+    url, _ = server_url
+    pool = PhConnectionPool()
+
+    with pytest.raises(HTTPError) as e:
+        ph_request(url + "/moved", {}, "text/plain", b"x", "POST", pool=pool)
+
+    assert e.value.status == 302
+    pool.close()
+
+
+@pytest.mark.parametrize(
+    "url, port", [("http://[::1]/api/sys", 80), ("https://[::1]/api/sys", 443)]
+)
+def test_pool_connects_to_ipv6_host_without_port(url: str, port: int):
+    conn, reused = PhConnectionPool()._get_conn(urlsplit(url), None)
+
+    assert not reused
+    assert (conn.host, conn.port) == ("::1", port)
+
+
+def test_pool_raises_url_error():
+    pool = PhConnectionPool()
+
+    with pytest.raises(URLError):
+        ph_request("wrong-url1", {}, "text/plain", pool=pool)
+
+    with pytest.raises(URLError):
+        ph_request("http://127.0.0.1:1", {}, "text/plain", pool=pool)
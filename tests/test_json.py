@@ -6,6 +6,7 @@ from zoneinfo import ZoneInfo
 import pytest
 
 import phable.kinds as kinds
+from phable.io import json_decoder
 from phable.io.json_decoder import (
     JsonDecoder,
     _haystack_to_iana_tz,
@@ -622,6 +623,38 @@ def test_parse_grid_col(json_input: dict[str, Any], expected: kinds.Grid) -> Non
     assert JsonDecoder.from_json(json_input) == expected
 
 
+def test_parse_empty_grid() -> None:
+    json_input = {
+        "_kind": "grid",
+        "meta": {"ver": "3.0", "ok": {"_kind": "marker"}},
+        "cols": [{"name": "empty"}],
+        "rows": [],
+    }
+
+    assert JsonDecoder.from_json(json_input) == kinds.Grid(
+        {"ver": "3.0", "ok": kinds.Marker()}, [kinds.GridCol("empty")], []
+    )
+
+
+def test_parse_empty_grid_skips_cols_and_rows(monkeypatch: pytest.MonkeyPatch) -> None:
+    json_input = {
+        "_kind": "grid",
+        "meta": {"ver": "3.0", "ok": {"_kind": "marker"}},
+        "cols": [{"name": "empty"}],
+        "rows": [],
+    }
+
+    def _fail(*_):
+        raise AssertionError("empty grid should not be decoded entry by entry")
+
+    monkeypatch.setattr(json_decoder, "_parse_grid_col", _fail)
+    monkeypatch.setattr(json_decoder, "_parse_list", _fail)
+
+    assert JsonDecoder.from_json(json_input) == kinds.Grid(
+        {"ver": "3.0", "ok": kinds.Marker()}, [kinds.GridCol("empty")], []
+    )
+
+
 # -----------------------------------------------------------------------------
 # To Grid from JSON and back to JSON again with nested data structures
 # -----------------------------------------------------------------------------
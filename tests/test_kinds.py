@@ -34,6 +34,11 @@ def test_grid():
     assert str(grid) == "Haystack Grid"
 
 
+def test_grid_is_empty():
+    assert Grid(meta={}, cols=[], rows=[]).is_empty
+    assert not Grid.to_grid({"x": 1}).is_empty
+
+
 def test_to_grid_without_meta():
     # test #1
     rows = [
@@ -75,6 +80,18 @@ def test_to_grid_without_meta():
     }
 
 
+def test_grid_column():
+    rows = [
+        {"ts": TS_NOW - timedelta(minutes=5), "v0": Number(50, "kW")},
+        {"ts": TS_NOW, "v0": Number(45, "kW"), "v1": Number(50, "kW")},
+    ]
+    grid = Grid.to_grid(rows)
+
+    assert grid.column("v0") == [Number(50, "kW"), Number(45, "kW")]
+    assert grid.column("v1") == [None, Number(50, "kW")]
+    assert grid.column("ts") == [TS_NOW - timedelta(minutes=5), TS_NOW]
+
+
 def test_to_grid_with_meta():
     # test #1
     meta = {"test_meta": "Hi!"}